@@ -1,9 +1,6 @@
-import argparse
-import json
 import logging
 import logging.config
 import os
-import signal
 import socket
 import sys
 import time
@@ -11,18 +8,28 @@ import datetime
 import threading
 import select
 from queue import Queue
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
 
 import asyncio
 import discord
 from discord.ext import commands
 import dotenv
+import orjson
 
+from helpers.ipc import disable_nagle, get_manager_address, pack_message, recv_message
+from helpers.logs import disable_log_record_extras, queue_root_handlers
 
-class BotBase(ABC):
 
-    def __init__(self, bot_id=None):
+class BotMeta(ABCMeta, commands.CogMeta):
+    """Metaclass for bots, which are both abstract base classes and discord.py cogs."""
+
+
+class BotBase(ABC, commands.Cog, metaclass=BotMeta):
+    """Base class for bots. As a cog, its commands are collected once when each bot class is defined."""
+
+    def __init__(self, bot_id=None, manager_fd=None):
         self.bot_id = bot_id or self.__class__.__name__
+        self.manager_fd = manager_fd # Inherited socket connected to the Manager, if it started this bot
         self.bot_thread = None
         self._running = False
         self.manager_socket = None # Socket to communicate with Manager
@@ -33,8 +40,7 @@ class BotBase(ABC):
         self.setup_logging() # Run this before anything that might log
         self.config = self.load_config()
         
-        address = self.config.get("Manager", {}).get("host"), self.config.get("Manager", {}).get("port")
-        self.server_address = (address) if self.config.get("Manager") else None
+        self.server_family, self.server_address = get_manager_address(self.config) if self.config.get("Manager") else (None, None)
 
         envtoken = self.config.get("Bots", {}).get(self.bot_id, {}).get("envtoken")
         if not envtoken:
@@ -47,22 +53,52 @@ class BotBase(ABC):
 
         self.discord_setup()
 
+    @classmethod
+    def main(cls):
+        """Build the bot from the command line arguments the Manager passes and run it."""
+        if "-h" in sys.argv or "--help" in sys.argv:
+            import argparse # Only build a parser when help text is actually wanted
+            parser = argparse.ArgumentParser(description=f"Run a {cls.__name__}.")
+            parser.add_argument( "--bot_id", help="The bot ID.")
+            parser.add_argument("--manager_fd", type=int, help="File descriptor of a socket already connected to the Manager.")
+            parser.parse_args()
+
+        # Every option is a "--name value" pair, so pair up the arguments instead of importing argparse on each start
+        args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+        manager_fd = args.get("--manager_fd")
+
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy()) # discord.py runs on whichever loop the policy creates
+        except ImportError:
+            pass # uvloop does not support Windows, keep asyncio's default loop there
+
+        bot = cls(bot_id=args.get("--bot_id"), manager_fd=int(manager_fd) if manager_fd else None)
+        bot.run()
+
     def start_communication_thread(self):
+        # A socket pair lets shutdown wake the communication thread out of its blocking select
+        self.wakeup_receiver, self.wakeup_sender = socket.socketpair()
         self.communication_thread = threading.Thread(target=self.communication_loop)
         self.communication_thread.start()
 
     def communication_loop(self):
         while self._running:
-            ready_to_read, _, _ = select.select([self.manager_socket], [], [], 1)
+            ready_to_read, _, _ = select.select([self.manager_socket, self.wakeup_receiver], [], [])
+            if self.wakeup_receiver in ready_to_read:
+                break # Woken by shutdown
             if ready_to_read:
                 try:
-                    message = self.manager_socket.recv(1024).decode('utf-8')
-                    if message and message != 'OK':
-                        ack_message = json.dumps({"status": "OK", "bot_id": self.bot_id})
-                        self.manager_socket.sendall(ack_message.encode('utf-8')) # ACK
+                    message = recv_message(self.manager_socket)
+                    if message is None:
+                        logging.info("Manager closed the connection.")
+                        break
+                    if message.get("status") != "OK":
+                        ack_message = pack_message({"status": "OK", "bot_id": self.bot_id})
+                        self.manager_socket.sendall(ack_message) # ACK
                         with self.queue_lock: # Acquire the lock before adding to the queue
-                            self.message_queue.put(json.loads(message)) # Add message to the queue
-                    elif message == 'OK':
+                            self.message_queue.put(message) # Add message to the queue
+                    else:
                         if self.waiting_for_ack:
                             logging.info("Received ACK from Manager.")
                         else:
@@ -76,19 +112,24 @@ class BotBase(ABC):
 
         logging.info("Communication thread is stopping.")
 
-    def send_message(self, json):
+    def send_message(self, message):
         if self.manager_socket:
-            logging.info(f"Sending message: {json}")
+            logging.info(f"Sending message: {message}")
             try:
-                self.manager_socket.sendall(json.encode('utf-8'))
+                with self.ack_condition:
+                    self.waiting_for_ack = True # Set before sending so an ACK that arrives immediately is not missed
+                self.manager_socket.sendall(pack_message(message))
                 self.wait_for_ack()
             except Exception as e:
                 logging.error(f"Error sending message: {e}")
 
     def create_socket(self):
+        if self.manager_fd is not None:
+            return socket.socket(fileno=self.manager_fd) # Already connected by the Manager
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s = socket.socket(self.server_family, socket.SOCK_STREAM)
             s.connect(self.server_address)
+            disable_nagle(s)
             return s
         except Exception as e:
             logging.error(f"Error creating socket: {e}")
@@ -97,15 +138,14 @@ class BotBase(ABC):
     def wait_for_ack(self, timeout=None):
         """Wait for an ACK from the Manager."""
         with self.ack_condition:
-            self.waiting_for_ack = True
             while self.waiting_for_ack:
                 self.ack_condition.wait(timeout)
 
     def load_config(self):
         """Load the full configuration from the config.json file."""
         try:
-            with open('config.json', 'r') as f:
-                config = json.load(f)
+            with open('config.json', 'rb') as f:
+                config = orjson.loads(f.read())
         except Exception as e:
             logging.error(f"Failed to load configuration: {e}")
             return {}
@@ -116,11 +156,10 @@ class BotBase(ABC):
         self._running = True
 
         # Setup communication with the manager
-        self.manager_socket = self.create_socket() if self.server_address else None
+        self.manager_socket = self.create_socket() if self.server_address or self.manager_fd is not None else None
         if self.manager_socket:
             self.start_communication_thread()
-            connected_message = json.dumps({"status": "connected", "bot_id": self.bot_id})
-            self.send_message(connected_message)
+            self.send_message({"status": "connected", "bot_id": self.bot_id})
         else:
             logging.info("No server address provided. Running without a Manager.")
 
@@ -136,6 +175,7 @@ class BotBase(ABC):
             time.sleep(0.1)
 
         logging.info(f"Bot is stopping.")
+        self.log_listener.stop() # Write out the queued records before the process exits
 
     @abstractmethod
     def main_loop(self):
@@ -148,30 +188,39 @@ class BotBase(ABC):
             self.shutdown()
 
     def setup_logging(self):
-        with open("logging.json", "r") as f:
-            config = json.load(f)
+        with open("logging.json", "rb") as f:
+            config = orjson.loads(f.read())
 
         # Create logging directory if it doesn't exist
         logs_dir = "logging"
-        if not os.path.exists(logs_dir):
-            os.makedirs(logs_dir)
+        os.makedirs(logs_dir, exist_ok=True)
 
         date = datetime.datetime.now().strftime("%Y-%m-%d")
-        config["handlers"]["default"]["filename"] = os.path.join(logs_dir, f"{date}_{self.bot_id}.log")
+        filename = config["handlers"]["default"]["filename"].format(date=date, name=self.bot_id)
+        config["handlers"]["default"]["filename"] = os.path.join(logs_dir, filename)
         logging.config.dictConfig(config)
+        disable_log_record_extras()
+        self.log_listener = queue_root_handlers() # Keep file and console writes off the event loop
 
     @abstractmethod
     def initialize_bot_commands(self):
-        # Add defaults
-        self.bot.add_command(self.hello)
+        # Commands are added with the cog once the bot's event loop is running
+        self.bot.setup_hook = self.add_commands
         self.bot.add_listener(self.on_ready)
-        
-        # Add custom commands from config
-        custom_commands = self.config.get('commands', [])
-        for command in custom_commands:
-            if hasattr(self, command):
-                self.bot.add_command(getattr(self, command))
-            else:
+
+    async def add_commands(self):
+        """Add this bot's commands to discord.py by registering the bot as a cog."""
+        await self.bot.add_cog(self)
+
+        # Keep the default commands plus the custom commands enabled for this bot in config
+        enabled_commands = self.config.get("Bots", {}).get(self.bot_id, {}).get("commands")
+        if enabled_commands is None:
+            return
+        for command in self.get_commands():
+            if command.name != "hello" and command.name not in enabled_commands:
+                self.bot.remove_command(command.name)
+        for command in enabled_commands:
+            if self.bot.get_command(command) is None:
                 logging.warning(f"Command {command} not found in bot methods.")
 
     @abstractmethod
@@ -191,6 +240,7 @@ class BotBase(ABC):
         self.discord_stop()
 
         if self.communication_thread.is_alive():
+            self.wakeup_sender.send(b"\0") # Wake the communication thread so it notices the bot is stopping
             self.communication_thread.join(timeout=5)  # wait for the communication thread to finish
 
         if self.communication_thread.is_alive():
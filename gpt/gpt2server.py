@@ -1,14 +1,15 @@
 import threading
 import torch
 import socket
-import json
+import orjson
 from cryptography.fernet import Fernet
 from transformers import GPT2LMHeadModel, GPT2Tokenizer
 from helpers.encryption import get_env_key
+from helpers.ipc import recv_until_closed
 
 # Load the configuration
-with open('config.json') as f:
-    config = json.load(f)
+with open('config.json', 'rb') as f:
+    config = orjson.loads(f.read())
 
 # Get the GPT2Server credentials from the configuration
 host = config['GPT2Server']['host']
@@ -46,14 +47,14 @@ def server_thread():
             c, addr = s.accept()
             print('Got connection from', addr)
 
-            # Receive a message, decrypt it, and print it
-            encrypted_msg = c.recv(1024)
+            # Receive the whole message (the bot shuts down its side once sent), decrypt it, and print it
+            encrypted_msg = recv_until_closed(c)
 
-            decrypted_msg = cipher_suite.decrypt(encrypted_msg)
-            print('Received message:', decrypted_msg.decode())
+            decrypted_msg = cipher_suite.decrypt(encrypted_msg).decode()  # Decode once for both uses below
+            print('Received message:', decrypted_msg)
 
             # Process the message using the GPT-2 model
-            input_ids = tokenizer.encode(decrypted_msg.decode(), return_tensors='pt')
+            input_ids = tokenizer.encode(decrypted_msg, return_tensors='pt')
 
             # If CUDA is available, move the input_ids tensor to the GPU
             if torch.cuda.is_available():
@@ -64,7 +65,7 @@ def server_thread():
 
             # Send the response
             encrypted_response = cipher_suite.encrypt(response.encode())
-            c.send(encrypted_response)
+            c.sendall(encrypted_response)
 
             # Close the connection
             c.close()
@@ -1,24 +1,19 @@
-import argparse
 import logging
-import discord
-import json
 import socket
 from cryptography.fernet import Fernet
 from discord.ext import commands
 from botbase import BotBase
 from helpers.encryption import get_env_key
+from helpers.ipc import recv_until_closed
 
 class GPTBot(BotBase):
     """
     A subclass of Bot that implements ChatGPT bot specific commands.
     """
 
-    def __init__(self, bot_id=None):
-        super().__init__(bot_id)
-        # Load the configuration
-        with open('config.json') as f:
-            self.config = json.load(f)
-        # Get the GPT2Server credentials from the configuration
+    def __init__(self, bot_id=None, manager_fd=None):
+        super().__init__(bot_id, manager_fd)
+        # Get the GPT2Server credentials from the configuration BotBase already loaded
         self.host = self.config['GPT2Server']['host']
         self.port = self.config['GPT2Server']['port']
         # Generate a key and create a cipher object
@@ -53,11 +48,12 @@ class GPTBot(BotBase):
         # Encrypt the message
         encrypted_msg = self.cipher_suite.encrypt(message.encode())
 
-        # Send the message
-        s.send(encrypted_msg)
+        # Send the whole message, then shut down our side so the server knows it is complete
+        s.sendall(encrypted_msg)
+        s.shutdown(socket.SHUT_WR)
 
-        # Receive the response
-        encrypted_response = s.recv(1024)
+        # Receive the response, however long it is
+        encrypted_response = recv_until_closed(s)
 
         # Decrypt the response
         response = self.cipher_suite.decrypt(encrypted_response)
@@ -90,9 +86,4 @@ class GPTBot(BotBase):
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Run a TestBot.")
-    parser.add_argument( "--bot_id", help="The bot ID.")
-    args = parser.parse_args()
-
-    bot = GPTBot(bot_id=args.bot_id)
-    bot.run()
+    GPTBot.main()
@@ -12,13 +12,11 @@ def get_env_key():
         return os.getenv('ENCRYPTION_KEY')
 
     # Generate a new key
-    key = Fernet.generate_key()
+    key = Fernet.generate_key().decode()  # Decode once for both the .env file and the caller
 
     # Store the key in the .env file
     with open('.env', 'a') as f:
-        f.write(f'\nENCRYPTION_KEY={key.decode()}')
+        f.write(f'\nENCRYPTION_KEY={key}')
 
     print("Encryption key generated and stored in .env file.")
-    return key.decode()  # Return the key
-
-get_env_key()
\ No newline at end of file
+    return key  # Return the key
\ No newline at end of file
@@ -0,0 +1,132 @@
+import os
+import socket
+import struct
+import tempfile
+
+import orjson
+
+def get_manager_address(config):
+    """Return the (family, address) pair the Manager listens on for bot connections.
+
+    On POSIX this is a Unix domain socket, so messages between the Manager and its bots skip the loopback TCP stack.
+    Python has no AF_UNIX support on Windows, where the host and port from the Manager config are used instead.
+    """
+    manager_config = config.get("Manager", {})
+    if hasattr(socket, "AF_UNIX"):
+        return socket.AF_UNIX, os.path.join(tempfile.gettempdir(), f"botmanager-{manager_config.get('port')}.sock")
+    return socket.AF_INET, (manager_config.get("host"), manager_config.get("port"))
+
+def disable_nagle(sock):
+    """Send small messages on a TCP socket immediately instead of holding them back for Nagle's algorithm."""
+    if sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+# Every message is a JSON payload preceded by its length as a 4-byte little-endian unsigned int.
+# The header format is compiled once instead of being re-parsed by every pack and unpack
+HEADER = struct.Struct("<I")
+HEADER_SIZE = HEADER.size
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024 # Bytes, far above any real message
+
+def pack_message(message):
+    """Serialise a message and prefix it with its length."""
+    payload = orjson.dumps(message)
+    return HEADER.pack(len(payload)) + payload
+
+class FrameError(ValueError):
+    """Raised when a peer sends bytes that cannot be a valid message, after which the connection is unusable."""
+
+def check_length(length):
+    """Reject a length header too large to belong to a real message, which would otherwise buffer without limit."""
+    if length > MAX_MESSAGE_SIZE:
+        raise FrameError(f"Message length {length} exceeds the {MAX_MESSAGE_SIZE} byte limit.")
+
+def decode_payload(payload):
+    """Decode a message payload, raising FrameError if it is not valid JSON."""
+    try:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
+        raise FrameError(f"Invalid message payload: {e}") from e
+
+def unpack_messages(buffer):
+    """Yield every complete message at the front of a bytearray, removing the consumed bytes when iteration ends.
+    Raises FrameError on a malformed message; the messages before it have already been yielded.
+    """
+    offset = 0
+    view = memoryview(buffer)  # Decode payloads in place instead of copying each one out
+    try:
+        while len(buffer) - offset >= HEADER_SIZE:
+            (length,) = HEADER.unpack_from(buffer, offset)
+            check_length(length)
+            start = offset + HEADER_SIZE
+            end = start + length
+            if len(buffer) < end:
+                break  # The rest of this message has not arrived yet
+            try:
+                message = orjson.loads(view[start:end])
+            except orjson.JSONDecodeError as e:  # Raised here so no traceback keeps a slice of the buffer alive
+                raise FrameError(f"Invalid message payload: {e}") from None
+            offset = end
+            yield message
+    finally:
+        view.release()
+        del buffer[:offset]  # Drop every consumed message with a single move
+
+def get_iov_max():
+    """Return how many buffers a single sendmsg call accepts, as larger batches fail with EMSGSIZE."""
+    try:
+        iov_max = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):  # Windows has no sysconf, and some platforms do not report the limit
+        iov_max = -1
+    return iov_max if iov_max > 0 else 1024
+
+IOV_MAX = get_iov_max()
+
+def send_frames(sock, frames):
+    """Send several packed messages from a non-blocking socket, in a single system call where the platform supports it.
+    Returns the frames that did not fit in the socket buffer, the first possibly cut short, which is empty once everything is sent.
+    """
+    if not hasattr(sock, "sendmsg"):  # Windows sockets have no sendmsg
+        frames = [b"".join(frames)]
+    try:
+        if len(frames) == 1:
+            sent = sock.send(frames[0])
+        else:
+            sent = sock.sendmsg(frames[:IOV_MAX])  # Later frames wait for the next write
+    except BlockingIOError:
+        sent = 0  # The socket buffer is full
+    for index, frame in enumerate(frames):
+        if sent < len(frame):
+            return [frame[sent:], *frames[index + 1:]] if sent else frames[index:]
+        sent -= len(frame)
+    return []
+
+def recv_exact(sock, size):
+    """Read exactly size bytes from a blocking socket. Returns None if the peer closes the connection first."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            return None
+        received += count
+    return buffer
+
+def recv_message(sock):
+    """Read one message from a blocking socket. Returns None if the peer closes the connection."""
+    header = recv_exact(sock, HEADER_SIZE)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    check_length(length)
+    payload = recv_exact(sock, length)
+    if payload is None:
+        return None
+    return decode_payload(payload)
+
+def recv_until_closed(sock):
+    """Read from a blocking socket until the peer shuts down its side and return everything received."""
+    chunks = []
+    while chunk := sock.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
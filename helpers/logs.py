@@ -0,0 +1,23 @@
+import logging
+import logging.handlers
+import queue
+
+def disable_log_record_extras():
+    """Stop collecting the caller frame, thread, process and task on every log record. The logging.json format prints none of them."""
+    logging._srcfile = None  # Skips the stack walk behind %(filename)s, %(lineno)d and %(funcName)s
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+
+def queue_root_handlers():
+    """Move the root logger's handlers behind a queue so logging calls never wait on disk I/O. Returns the started listener that writes the records."""
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,43 @@
+import time
+import asyncio
+
+class AIMDLimiter:
+    """Concurrency limit that grows additively while requests complete quickly and shrinks multiplicatively when they slow down or are throttled."""
+
+    def __init__(self, limit=4, max_limit=8, increase=0.5, decrease=0.5, target_latency=0.4, smoothing=0.2):
+        if max_limit < 1:
+            raise ValueError("max_limit must be at least 1.")
+        self.limit = float(min(limit, max_limit)) # Fractional so several fast requests add up to one more slot
+        self.max_limit = max_limit
+        self.increase = increase # Slots added after a request that kept latency on target
+        self.decrease = decrease # Factor applied to the limit after a slow or throttled request
+        self.target_latency = target_latency # Seconds
+        self.smoothing = smoothing # Weight of the newest sample in the latency average
+        self.latency = None # Moving average of request latency in seconds
+        self.decreased_at = None # When the limit last shrank, so one slow burst only shrinks it once
+        self.active = 0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait until a request can start within the current limit."""
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < max(1, int(self.limit)))
+            self.active += 1
+
+    async def release(self, latency, throttled=False):
+        """Finish a request and adjust the limit from how long it took and whether it was throttled."""
+        async with self.condition:
+            self.active -= 1
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+            if throttled or latency > self.target_latency:
+                # Requests already in flight saw the same congestion, so wait one window before shrinking again
+                now = time.monotonic()
+                if self.decreased_at is None or now - self.decreased_at >= max(self.latency, self.target_latency):
+                    self.limit = max(1.0, self.limit * self.decrease)
+                    self.decreased_at = now
+            elif self.latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + self.increase)
+            self.condition.notify_all()
@@ -1,258 +1,515 @@
+import errno
 import os
+import shutil
 import subprocess
 import threading
+import time
 import logging
 import logging.config
-import time
-import psutil
+import logging.handlers
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import tkinter as tk
-import json
+from tkinter import ttk
+import selectors
 import socket
-import socketserver
+import orjson
+from helpers.ipc import FrameError, disable_nagle, get_manager_address, pack_message, send_frames, unpack_messages
+from helpers.logs import disable_log_record_extras, queue_root_handlers
+
+# Bots log to files, so on Windows they do not need a console window of their own
+BOT_CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+
+# The GUI checks for work from the I/O thread quickly while bots are active and backs off while they are quiet
+GUI_POLL_MIN_MS = 5
+GUI_POLL_MAX_MS = 250
+
+# How long get_bot_log_file trusts its previous answer, so repeated Open Log clicks skip the directory scan
+LOG_FILE_CACHE_SECONDS = 1.0
+
+# Messages queued for one bot before it is treated as stuck and disconnected
+MAX_PENDING_FRAMES = 10000
 
 class Manager:
     def __init__(self):
         self.bot_processes = {}
-        self.client_sockets = {}
-        self.client_sockets_lock = threading.RLock()  # Add a re-entrant lock for client_sockets thread safety
+        self.client_sockets = {}  # Bot connections by bot_id, only touched by the I/O thread
+        self.receive_buffers = {}  # Partially received messages per connection, only touched by the I/O thread
+        self.read_view = memoryview(bytearray(65536))  # Reused by the I/O thread for every socket read
+        self.pending_sends = {}  # Packed messages per connection, written by the I/O thread once per select round
+        self.write_blocked = set()  # Connections whose socket buffer is full, watched for writability until they drain
+        # Work handed between the GUI and I/O threads. Each deque has one producer and one consumer,
+        # and append/popleft are atomic, so neither side takes a lock
+        self.io_calls = deque()  # Work handed to the I/O thread by the GUI thread
+        self.gui_calls = deque()  # Work handed to the GUI thread by the I/O thread
+        self.gui_poll_interval = GUI_POLL_MIN_MS
+        self.selector = selectors.DefaultSelector()
+        self.server_socket = None
+        self.io_thread = None
         self.shuttingdown = False
+        self.log_listener = None
+        self.log_filename_template = None
+        self.manager_log_file = None
+        self.log_file_cache = {}  # Latest log file per bot as (time looked up, path)
+        self.file_executor = ThreadPoolExecutor(max_workers=1)  # Runs log file work in order, off the Tk thread
+        # Windows opens files through the shell with os.startfile; elsewhere resolve the desktop's opener once
+        self.opener = None if os.name == "nt" else shutil.which("xdg-open") or shutil.which("open")
         self.configure_logging()
         self.load_configuration()
         self.initialize_gui()
-        
+        self.start_server()
+
+        self.root.mainloop()  # Start the GUI (BLOCKING)
+
+        self.cleanup()
+
+    def start_server(self):
+        """Open the server socket for communication with bots and start the I/O thread that serves every connection."""
         try:
-            # Configure server socket for communication with bots
-            self.server = socketserver.ThreadingTCPServer(self.server_address, self.communication_loop)
-            self.server_thread = threading.Thread(target=self.server.serve_forever)
-            self.server_thread.start()
-        except socket.error as e:
+            if isinstance(self.server_address, str):
+                self.remove_stale_socket_file()
+            self.server_socket = socket.socket(self.server_family, socket.SOCK_STREAM)
+            self.server_socket.bind(self.server_address)
+            self.server_socket.listen()
+            self.server_socket.setblocking(False)
+            self.selector.register(self.server_socket, selectors.EVENT_READ, self.accept_connection)
+        except OSError as e:
             logging.error(f"Failed to start server: {e}")
-            self.server = None
+            self.server_socket = None
+
+        # A socket pair lets other threads wake the I/O thread out of its blocking select
+        self.wakeup_receiver, self.wakeup_sender = socket.socketpair()
+        self.wakeup_receiver.setblocking(False)
+        self.selector.register(self.wakeup_receiver, selectors.EVENT_READ, self.drain_wakeup)
+        self.io_thread = threading.Thread(target=self.io_loop, daemon=True)
+        self.io_thread.start()
+
+    def cleanup(self):
+        """Release the manager's resources once the GUI has closed."""
+        self.stop_server()
+        self.file_executor.shutdown()  # Let a running clear_logs restart the log listener before it is stopped
+        if self.log_listener:
+            self.log_listener.stop()  # Write out queued records, including those logged while shutting down
+
+    def stop_server(self):
+        """Stop the I/O thread, then close the server socket and every bot connection."""
+        self.shuttingdown = True
+        if self.io_thread:
+            self.wakeup_sender.send(b"\0")
+            self.io_thread.join()
+            self.wakeup_sender.close()
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fileobj)
+            if key.data == self.receive_message:
+                try:
+                    # Ends the connection for the bot at once, even if another descriptor still refers to the socket
+                    key.fileobj.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # The bot already disconnected
+            key.fileobj.close()
+        self.selector.close()
+        self.client_sockets.clear()
+        if isinstance(self.server_address, str) and self.server_socket is not None:
+            self.remove_socket_file()  # Only remove the file this manager bound, never another manager's
+
+    def remove_stale_socket_file(self):
+        """Remove a socket file left behind by a previous run. Raises OSError if another manager is still listening on it."""
+        probe = socket.socket(self.server_family, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.server_address)
+        except (ConnectionRefusedError, FileNotFoundError):
+            self.remove_socket_file()  # Nothing is listening, so the file is stale
+            return
+        finally:
+            probe.close()
+        raise OSError(errno.EADDRINUSE, "Another manager is already listening on", self.server_address)
 
-        self.root.mainloop()  # Start the GUI (BLOCKING)
-        
-        # Wait for server thread to finish
-        #TODO: Stop bot processes if configured to do so
-        self.server.shutdown()
-        self.server_thread.join()
-
-    def communication_loop(self, request_socket, client_address, server):
-        """Process thread loop for each client connection."""
+    def remove_socket_file(self):
+        """Delete the Unix domain socket file the server binds to, if there is one."""
         try:
-            while not self.shuttingdown:
-                message = request_socket.recv(1024).decode('utf-8')
-                if message:
-                    message_dict = json.loads(message)
-                    bot_id = message_dict.get('bot_id')
-                    if message_dict.get('status') == 'OK':
-                        logging.info(f"Received ACK from bot {bot_id}")
-                    elif message_dict.get('status') != 'OK':
-                        request_socket.sendall('OK'.encode('utf-8')) # ACK
-                        self.process_message(request_socket, message_dict, bot_id)
+            os.remove(self.server_address)
+        except FileNotFoundError:
+            pass
+
+    def io_loop(self):
+        """Block until sockets are ready and dispatch their callbacks, so an idle manager never wakes up."""
+        while not self.shuttingdown:
+            for key, events in self.selector.select():
+                if events & selectors.EVENT_READ:
+                    key.data(key.fileobj)
+                if events & selectors.EVENT_WRITE and key.fileobj in self.pending_sends:
+                    self.write_pending(key.fileobj)  # A full socket buffer has room again
+            self.flush_sends()  # Write everything the callbacks queued, one system call per connection
+
+    def drain_wakeup(self, wakeup_receiver):
+        """Discard the bytes used to wake the I/O thread and run the work queued for it."""
+        wakeup_receiver.recv(1024)
+        while self.io_calls:
+            callback, args = self.io_calls.popleft()
+            callback(*args)
+
+    def call_in_io_thread(self, callback, *args):
+        """Run a callback on the I/O thread, which owns the selector and every bot connection."""
+        self.io_calls.append((callback, args))
+        self.wakeup_sender.send(b"\0")
+
+    def call_in_gui_thread(self, callback, *args):
+        """Run a callback on the Tk thread the next time it processes GUI events."""
+        self.gui_calls.append((callback, args))
+
+    def process_gui_calls(self):
+        """Run the work the I/O thread queued for the GUI, then check again after an interval that grows while idle."""
+        busy = bool(self.gui_calls)
+        while self.gui_calls:
+            callback, args = self.gui_calls.popleft()
+            callback(*args)
+        if busy:
+            self.gui_poll_interval = GUI_POLL_MIN_MS
+        else:
+            self.gui_poll_interval = min(self.gui_poll_interval * 2, GUI_POLL_MAX_MS)
+        self.root.after(self.gui_poll_interval, self.process_gui_calls)
+
+    def accept_connection(self, server_socket):
+        """Accept a new bot connection and watch it for incoming messages."""
+        try:
+            request_socket, _ = server_socket.accept()
+        except BlockingIOError:
+            return
+        disable_nagle(request_socket)  # ACKs and commands are tiny and must not wait for delayed ACKs
+        self.watch_connection(request_socket)
+        logging.info("Accepted a bot connection.")
+        # A bot sends its connected message right after connecting, so try reading it now instead of after another select
+        self.receive_message(request_socket)
+
+    def watch_connection(self, request_socket):
+        """Watch a bot connection for incoming messages."""
+        request_socket.setblocking(False)
+        self.receive_buffers[request_socket] = bytearray()  # Created once per connection, not per read
+        self.selector.register(request_socket, selectors.EVENT_READ, self.receive_message)
+
+    def close_connection(self, request_socket):
+        """Stop watching a bot connection and forget any bot registered on it."""
+        self.selector.unregister(request_socket)
+        request_socket.close()
+        self.receive_buffers.pop(request_socket, None)
+        self.pending_sends.pop(request_socket, None)
+        self.write_blocked.discard(request_socket)
+        # Snapshot only the matching bot ids rather than copying the whole dictionary
+        for bot_id in [bot_id for bot_id, client_socket in self.client_sockets.items() if client_socket is request_socket]:
+            del self.client_sockets[bot_id]
+            logging.info(f"Bot {bot_id} disconnected.")
+
+    def receive_message(self, request_socket):
+        """Read from a client connection and hand every complete message to process_message."""
+        try:
+            count = request_socket.recv_into(self.read_view)
+            if not count:
+                self.close_connection(request_socket)  # The bot closed the connection
+                return
+            buffer = self.receive_buffers[request_socket]
+            buffer += self.read_view[:count]
+            for message in unpack_messages(buffer):
+                self.process_message(request_socket, message)
+        except BlockingIOError:
+            pass  # Nothing has arrived yet, the selector will report the connection when it does
+        except ConnectionError:
+            self.close_connection(request_socket)
+        except FrameError as e:
+            logging.error(f"Closing a bot connection after a malformed message: {e}")
+            self.close_connection(request_socket)
         except Exception as e:
             logging.error(f"An error occurred: {e}")
 
-    def process_message(self, request, message_dict, bot_id):
-        """Process incoming message from a bot."""
+    def process_message(self, request, message_dict):
+        """Process an incoming message from a bot."""
+        bot_id = message_dict.get('bot_id')
+        status = message_dict.get('status')
+        if status == 'OK':
+            logging.info(f"Received ACK from bot {bot_id}")
+            return
+
+        self.queue_frame(request, pack_message({"status": "OK"})) # ACK
         # Handle connected status message
-        if message_dict.get('status') == 'connected':
-            with self.client_sockets_lock:  # Acquire the lock before modifying the dictionary
-                self.client_sockets[bot_id] = request  # Add the socket to the dictionary
-                logging.info(f"Bot {bot_id} connected.")
+        if status == 'connected':
+            self.client_sockets[bot_id] = request  # Add the socket to the dictionary
+            logging.info(f"Bot {bot_id} connected.")
+            self.call_in_gui_thread(self.on_bot_connected, bot_id)
         else:
             logging.error("Received message with unknown status.")
 
     def send_message(self, bot_id, message):
+        """Send a message to a bot. Safe to call from any thread."""
         logging.info(f"Sending message to bot {bot_id}: {message}")
-        with self.client_sockets_lock:  # Acquire the lock before accessing client_sockets
-            if bot_id in self.client_sockets:
-                try:
-                    self.client_sockets[bot_id].sendall(message.encode('utf-8'))
-                except OSError as e:
-                    if e.winerror == 10038:
-                        del self.client_sockets[bot_id] # The socket is closed, remove it from client_sockets
-                        logging.error(f"Socket for bot_id {bot_id} was closed")
-                    else:
-                        raise # Some other OSError occurred, re-raise it
-            else:
-                logging.error(f"No client connection found for bot_id {bot_id}")
+        self.call_in_io_thread(self.queue_message, bot_id, message)
+
+    def queue_message(self, bot_id, message):
+        """Queue a message for a bot's connection. Runs on the I/O thread."""
+        client_socket = self.client_sockets.get(bot_id)
+        if client_socket is None:
+            logging.error(f"No client connection found for bot_id {bot_id}")
+            return
+        self.queue_frame(client_socket, pack_message(message))
+
+    def queue_frame(self, request_socket, frame):
+        """Queue a packed message to be written when the current select round ends."""
+        frames = self.pending_sends.setdefault(request_socket, [])
+        if len(frames) >= MAX_PENDING_FRAMES:  # The bot has stopped reading, so its queue would only keep growing
+            logging.error("A bot is not reading its messages, closing its connection")
+            self.close_connection(request_socket)
+            return
+        frames.append(frame)
+
+    def flush_sends(self):
+        """Write every queued message, coalescing each connection's messages into one send."""
+        for request_socket in list(self.pending_sends):
+            if request_socket not in self.write_blocked:  # Blocked connections are written when the selector reports room
+                self.write_pending(request_socket)
+
+    def write_pending(self, request_socket):
+        """Send a connection's queued messages. Whatever does not fit stays queued and the connection is watched until it is writable."""
+        frames = self.pending_sends.pop(request_socket)
+        try:
+            remainder = send_frames(request_socket, frames)
+        except OSError as e:
+            logging.error(f"Failed to send to a bot, closing its connection: {e}")
+            self.close_connection(request_socket)
+            return
+        if remainder:
+            self.pending_sends[request_socket] = remainder
+            if request_socket not in self.write_blocked:
+                self.write_blocked.add(request_socket)
+                self.selector.modify(request_socket, selectors.EVENT_READ | selectors.EVENT_WRITE, self.receive_message)
+        elif request_socket in self.write_blocked:
+            self.write_blocked.discard(request_socket)
+            self.selector.modify(request_socket, selectors.EVENT_READ, self.receive_message)
 
     def load_configuration(self):
         """Load configurations from config.json."""
         try:
-            with open('config.json', 'r') as f:
-                self.config = json.load(f)
-            host = self.config.get("Manager", {}).get("host")
-            port = self.config.get("Manager", {}).get("port")
-            self.server_address = (host, port)  # Use the host and port from the config file
+            with open('config.json', 'rb') as f:
+                self.config = orjson.loads(f.read())
+            self.server_family, self.server_address = get_manager_address(self.config)  # Use the Manager settings from the config file
             self.bot_config = self.config.get("Bots", {})
+
+            # Build each bot's launch command once so start_bot only has to spawn the process
+            python_path = self.config.get("Manager", {}).get("pythonpath") # Launch the bot using the local venv python so our packages are available to it
+            if python_path:
+                python_path = os.path.abspath(shutil.which(python_path) or python_path)  # Resolve once so no start searches PATH or depends on the working directory
+            self.bot_commands = {
+                bot_id: [python_path, os.path.abspath(f"{bot['type'].lower()}.py"), "--bot_id", bot_id]
+                for bot_id, bot in self.bot_config.items()
+            }
         except Exception as e:
             logging.error(f"Failed to load configuration: {e}")
 
     def configure_logging(self):
         """Configure the logging system by reading the logging configuration from the logging.json file."""
-        if not os.path.exists("logging"):
-            os.makedirs("logging", exist_ok=True)
+        os.makedirs("logging", exist_ok=True)
         try:
-            with open("logging.json", "r") as f:
-                log_config = json.load(f)
+            with open("logging.json", "rb") as f:
+                log_config = orjson.loads(f.read())
+            # Keep the filename template so later log operations never re-read logging.json
+            self.log_filename_template = log_config["handlers"]["default"]["filename"]
             date_prefix = datetime.now().strftime("%Y-%m-%d")
-            class_name = self.__class__.__name__
-            filename = (
-                log_config["handlers"]["default"]["filename"]
-                .replace("{date}", date_prefix)
-                .replace("{name}", class_name)
-            )
-            log_config["handlers"]["default"]["filename"] = os.path.join(
-                "logging", filename
-            )
+            # The {date} and {name} placeholders are str.format fields, so one call fills both
+            filename = self.log_filename_template.format(date=date_prefix, name=self.__class__.__name__)
+            # The file handler rotates at midnight but keeps writing to this path, so it is valid for the whole run
+            self.manager_log_file = os.path.join("logging", filename)
+            log_config["handlers"]["default"]["filename"] = self.manager_log_file
             logging.config.dictConfig(log_config)
+            disable_log_record_extras()
+
+            self.log_listener = queue_root_handlers()
         except Exception as e:
             logging.error(f"Failed to configure logging: {e}")
 
     def get_bot_log_file(self, bot_id):
-        """Get the most recent log file for a bot."""
+        """Get the most recent log file for a bot. Answers from the last lookup if it is under a second old."""
+        now = time.monotonic()
+        cached = self.log_file_cache.get(bot_id)
+        if cached and now - cached[0] < LOG_FILE_CACHE_SECONDS:
+            return cached[1]
+
         log_dir = "logging"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
-        log_files = [f for f in os.listdir(log_dir) if bot_id in f]
-        if not log_files:
+        latest_log_file = None
+        latest_mtime = -1.0
+        try:
+            entries = os.scandir(log_dir)
+        except FileNotFoundError:
             return None
-        latest_log_file = max(log_files, key=lambda f: os.path.getmtime(os.path.join(log_dir, f)))
-        return os.path.join(log_dir, latest_log_file)
+        with entries:
+            for entry in entries:
+                if bot_id not in entry.name:
+                    continue
+                mtime = entry.stat().st_mtime
+                if mtime > latest_mtime:
+                    latest_mtime = mtime
+                    latest_log_file = entry.path
+        self.log_file_cache[bot_id] = (now, latest_log_file)
+        return latest_log_file
 
     def initialize_gui(self):
-        """Initialize the GUI. Create a new Tk root window and add a Start Bot, Stop Bot, Open Bot Log, and Open Manager Log button for each bot."""
+        """Initialize the GUI. Create a new Tk root window with Open Manager Log and Clear Logs buttons and a list of bots with Start, Stop and Open Log actions."""
         self.root = tk.Tk()  # Initialize the root window here
         self.root.protocol("WM_DELETE_WINDOW", self.shutdown)
         self.root.title("Bot Manager")  # Set the window title
         self.root.geometry("400x400")  # Set initial window size
 
-        # Add a button to open the manager log
-        open_manager_log_button = tk.Button(
-            self.root, text="Open Manager Log", command=self.open_manager_log
-        )
-        open_manager_log_button.pack(side="top")
-
-        # Add a button to clear all logs
-        clear_logs_button = tk.Button(
-            self.root, text="Clear Logs", command=self.clear_logs
-        )
-        clear_logs_button.pack(side="top")
-
-        # Create a canvas and a vertical scrollbar for scrolling
-        canvas = tk.Canvas(self.root)
-        scrollbar = tk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas)
+        # Add the manager-wide buttons
+        for text, command in (
+            ("Open Manager Log", self.open_manager_log),
+            ("Clear Logs", self.clear_logs),
+        ):
+            ttk.Button(self.root, text=text, command=command).pack(side="top")
 
-        # Configure the canvas to be scrollable
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.bind(
-            "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        # Define the button actions and their corresponding methods
+        self.actions = (
+            ("Start", self.start_bot),
+            ("Stop", self.stop_bot),
+            ("Open Log", self.open_log),
         )
 
-        # Pack the scrollbar and the canvas
+        # List every bot in one tree view instead of building a frame, label and buttons per bot.
+        # Each action gets a column; clicking its cell runs the action for the bot on that row.
+        action_columns = tuple(f"action{j}" for j in range(len(self.actions)))
+        self.bot_list = ttk.Treeview(self.root, columns=("name", "status") + action_columns, show="headings", selectmode="none")
+        self.bot_list.heading("name", text="Bot")
+        self.bot_list.heading("status", text="Status")
+        self.bot_list.column("name", width=130)
+        self.bot_list.column("status", width=80)
+        for column in action_columns:
+            self.bot_list.column(column, width=60, anchor="center")
+        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.bot_list.yview)
+        self.bot_list.configure(yscrollcommand=scrollbar.set)
+
+        # Pack the scrollbar and the bot list
         scrollbar.pack(side="right", fill="y")
-        canvas.pack(side="left", fill="both", expand=True)
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-
-        # Define the button actions and their corresponding methods
-        self.actions = [
-            {"name": "Start", "method": self.start_bot},
-            {"name": "Stop", "method": self.stop_bot},
-            {"name": "Open Log", "method": self.open_log},
-        ]
-
-        # Create a frame for each bot
-        for i, (bot_id, bot) in enumerate(self.config.get("Bots", {}).items()):
-            frame = tk.Frame(scrollable_frame)
-            frame.grid(
-                row=i, column=0, padx=10, pady=10
-            )  # Add padding and place the frame in the grid
-            # Create a label for the bot name
-            label = tk.Label(frame, text=bot['name'], anchor="e", width=20)
-            label.grid(row=0, column=0)
-            # Create buttons for each action and map the event to the corresponding action method
-            for j, action in enumerate(self.actions):
-                button = tk.Button(
-                    frame,
-                    text=action["name"],
-                    command=lambda bot_id=bot_id, action=action: action["method"](bot_id)
-                )
-                button.grid(row=0, column=j + 1)
+        self.bot_list.pack(side="left", fill="both", expand=True)
+
+        action_names = tuple(name for name, _ in self.actions)
+        # Map each action's display column ("#3" onwards, after name and status) straight to its method
+        self.column_actions = {f"#{j + 3}": method for j, (_, method) in enumerate(self.actions)}
+        for bot_id, bot in self.config.get("Bots", {}).items():
+            self.bot_list.insert("", "end", iid=bot_id, values=(bot['name'], "Stopped") + action_names)
+        self.bot_list.bind("<Button-1>", self.on_bot_list_click)
+        self.process_gui_calls()  # Start running the work the I/O thread hands to the GUI
+
+    def on_bot_list_click(self, event):
+        """Run the action whose cell was clicked for the bot on that row."""
+        bot_id = self.bot_list.identify_row(event.y)
+        action = self.column_actions.get(self.bot_list.identify_column(event.x))
+        if bot_id and action:
+            action(bot_id)
+
+    def on_bot_connected(self, bot_id):
+        """Show that a bot has connected to the manager."""
+        if bot_id in self.bot_processes:
+            self.set_bot_status(bot_id, "Connected")
+
+    def set_bot_status(self, bot_id, status):
+        """Show a bot's status in the bot list."""
+        if self.bot_list.exists(bot_id):
+            self.bot_list.set(bot_id, "status", status)
+
+    def submit_file_work(self, function, *args):
+        """Run log file work on the file executor, logging any exception it raises instead of losing it in the future."""
+        self.file_executor.submit(function, *args).add_done_callback(self.report_file_work)
+
+    def report_file_work(self, future):
+        """Log the exception of a finished file executor task, if it raised one."""
+        if not future.cancelled() and future.exception() is not None:
+            logging.error(f"Log file task failed: {future.exception()}")
 
     def open_manager_log(self):
-        """Open the manager log file in Notepad++ or Notepad."""
-        today = datetime.now().strftime("%Y-%m-%d")  # Get today's date
-        manager_log_file = os.path.join(
-            "logging", f"{today}_manager.log"
-        )  # Use today's date to create the filename
-        if not os.path.exists(manager_log_file):
+        """Open the manager log file in the default viewer for log files."""
+        self.submit_file_work(self.view_manager_log)
+
+    def view_manager_log(self):
+        """Find the manager log file and open it in the log viewer. Runs on the file executor."""
+        if not self.manager_log_file or not os.path.exists(self.manager_log_file):
             logging.error(f"Manager log file does not exist.")
             return
+        self.spawn_viewer(self.manager_log_file, "manager")
+
+    def spawn_viewer(self, log_file, name):
+        """Open a log file in the default viewer for log files."""
         try:
-            subprocess.Popen(["notepad++.exe", manager_log_file])
-            logging.info(f"Opened manager log in Notepad++")
-        except FileNotFoundError:
-            try:
-                subprocess.Popen(["notepad.exe", manager_log_file])
-                logging.info(f"Opened manager log in Notepad")
-            except FileNotFoundError:
-                logging.error(
-                    f"Failed to open manager log file. Please ensure that Notepad or Notepad++ is installed."
-                )
+            if os.name == "nt":
+                os.startfile(log_file)  # The shell opens the file with the user's associated program
+            elif self.opener:
+                subprocess.Popen([self.opener, log_file])
+            else:
+                logging.error(f"Failed to open {name} log file. Please ensure that xdg-open is installed.")
+                return
+        except OSError as e:
+            logging.error(f"Failed to open {name} log file: {e}")
+            return
+        logging.info(f"Opened {name} log")
 
     def clear_logs(self):
         """Delete all log files."""
+        self.submit_file_work(self.delete_logs)
+
+    def delete_logs(self):
+        """Delete every file in the log directory and reopen the log handlers. Runs on the file executor."""
         log_dir = "logging"
-        if not os.path.exists(log_dir):
+        try:
+            entries = os.scandir(log_dir)
+        except FileNotFoundError:
             return
 
-        # Get the root logger
-        logger = logging.getLogger()
-
-        # Load the logging configuration
-        with open("logging.json", "r") as f:
-            log_config = json.load(f)
-
-        for filename in os.listdir(log_dir):
-            try:
-                log_file_path = os.path.abspath(os.path.join(log_dir, filename))
+        self.log_file_cache.clear()  # The cached paths are about to be deleted
 
-                # Get handlers which have a baseFilename set to log_file_path
-                handlers = [handler for handler in logger.handlers if isinstance(handler, logging.handlers.TimedRotatingFileHandler) and handler.baseFilename == log_file_path]
+        if self.log_listener is None:  # Logging was never configured, so no handler holds a log file open
+            with entries, ThreadPoolExecutor(max_workers=8) as executor:
+                executor.map(self.delete_log_entry, entries)
+            return
 
-                if not handlers:
-                    # No handler is associated with the file, delete it immediately
-                    os.remove(log_file_path)
-                    if os.path.exists(log_file_path):
-                        logging.error(f"Failed to delete {filename}. Validate the file is closed in notepad.")
+        # Pause the listener so nothing is written while its file handlers are swapped
+        self.log_listener.stop()
+        handlers = list(self.log_listener.handlers)
+        try:
+            # Close every file handler once up front so the loop below only has to delete files
+            file_handlers = [
+                handler for handler in handlers
+                if isinstance(handler, logging.handlers.TimedRotatingFileHandler)
+            ]
+            for handler in file_handlers:
+                handlers.remove(handler)
+                handler.close()
+
+            # Unlinking releases the GIL, so a few threads delete a large log directory faster than one
+            with entries, ThreadPoolExecutor(max_workers=8) as executor:
+                executor.map(self.delete_log_entry, entries)
+
+            # Recreate each file handler with the formatter and level of the one it replaces
+            for handler in file_handlers:
+                try:
+                    new_handler = logging.handlers.TimedRotatingFileHandler(handler.baseFilename, when="midnight")
+                except OSError as e:
+                    logging.error(f"Failed to reopen log file {handler.baseFilename}: {e}")
                     continue
-
-                for handler in handlers:
-                    # Remove the handler from the logger
-                    logger.removeHandler(handler)
-                    handler.close()
-
-                    # Check if the handler is properly closed
-                    if handler.stream is not None and not handler.stream.closed:
-                        logging.error(f"Failed to close the handler for {filename}.")
-                        continue
-
-                    # Delete the file
-                    os.remove(log_file_path)
-                    if os.path.exists(log_file_path):
-                        logging.error(f"Failed to delete {filename}. Validate the file is closed in notepad.")
-
-                    # Recreate a new handler with the loaded configuration
-                    new_handler = logging.handlers.TimedRotatingFileHandler(log_file_path, when="midnight")
-                    formatter_config = log_config["formatters"]["standard"]
-                    new_handler.setFormatter(logging.Formatter(formatter_config["format"], datefmt=formatter_config["datefmt"]))
-
-                    logger.addHandler(new_handler)
-            except Exception as e:
-                logging.error(f"Failed to delete {filename}. Reason: {e}")
+                new_handler.setFormatter(handler.formatter)
+                new_handler.setLevel(handler.level)
+                handlers.append(new_handler)
+        finally:
+            # Always resume logging, with whichever handlers are still open
+            self.log_listener.handlers = tuple(handlers)
+            self.log_listener.start()
+
+    def delete_log_entry(self, entry):
+        """Delete one file or subdirectory of the log directory."""
+        try:
+            # DirEntry answers the type checks from the directory listing without another stat
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)  # No handler writes into a subdirectory
+            else:
+                os.unlink(entry.path)
+        except PermissionError:
+            logging.error(f"Failed to delete {entry.name}. Validate the file is closed in the log viewer.")
+        except Exception as e:
+            logging.error(f"Failed to delete {entry.name}. Reason: {e}")
 
     def start_bot(self, bot_id):
         """Start a bot process."""
@@ -266,74 +523,77 @@ class Manager:
             return
 
         try:
-            # Construct the launch command to start the bot
-            python_path = self.config['Manager']['pythonpath'] # Launch the bot using the local venv python so our packages are available to it
-            command = [python_path] + [f"{bot_config['type']}.py", "--bot_id", bot_id]
+            command = list(self.bot_commands[bot_id])
 
-            # Start the bot process
-            bot_process = subprocess.Popen(command)
+            if os.name == "nt":
+                # Windows cannot pass sockets through Popen, so the bot connects to the server socket itself
+                bot_process = subprocess.Popen(command, creationflags=BOT_CREATIONFLAGS)
+            else:
+                # Hand the bot one end of a connected socket pair so it skips the connect/accept handshake
+                manager_socket, bot_socket = socket.socketpair()
+                try:
+                    command += ["--manager_fd", str(bot_socket.fileno())]
+                    bot_process = subprocess.Popen(command, pass_fds=(bot_socket.fileno(),))
+                except Exception:
+                    manager_socket.close()
+                    raise
+                finally:
+                    bot_socket.close()  # The bot process owns its end now
+                self.call_in_io_thread(self.watch_connection, manager_socket)
             self.bot_processes[bot_id] = bot_process
+            self.set_bot_status(bot_id, "Running")
             logging.info(f"Started bot {bot_id} with process id {bot_process.pid}")
         except Exception as e:
             logging.error(f"Failed to start bot {bot_id}: {e}")
 
     def stop_bot(self, bot_id, timeout=3):
         """Stop a bot process."""
-        with self.client_sockets_lock:  # Acquire the lock before accessing client_sockets
-            logging.info(f"Requesting {bot_id} stop.")
-            if bot_id in self.client_sockets:
-                try:
-                    self.send_message(bot_id, json.dumps({"command": "stop"}))
-                except OSError as e:
-                    if e.winerror == 10038:
-                        del self.client_sockets[bot_id] # The socket is closed, remove it from client_sockets
-                        logging.error(f"Socket for bot_id {bot_id} was closed")
-                    else:
-                        raise # Some other OSError occurred, re-raise it
-            else:
-                logging.error(f"No client connection found for bot_id {bot_id}")
-
-        if bot_id not in self.bot_processes or self.bot_processes[bot_id].poll() is not None:
-            logging.error(f"Bot {bot_id} is not running.")
-            return
-
-        try:
-            # Wait for the bot process to terminate
-            self.bot_processes[bot_id].wait(timeout)
-        except subprocess.TimeoutExpired:
-            # If the process does not terminate within the timeout, kill it
-            self.bot_processes[bot_id].kill()
-            self.bot_processes[bot_id].wait()  # Wait for the process to terminate
-
-        del self.bot_processes[bot_id]  # Remove the bot from the bot_processes dictionary
-        logging.info(f"Stopped bot {bot_id}")
+        self.stop_bots((bot_id,), timeout)
+
+    def stop_bots(self, bot_ids, timeout=3):
+        """Stop several bot processes. Every bot is asked to stop before any is waited on, so they all share one timeout."""
+        for bot_id in bot_ids:
+            self.request_stop(bot_id)
+
+        deadline = time.monotonic() + timeout
+        for bot_id in bot_ids:
+            bot_process = self.bot_processes.pop(bot_id, None)  # Remove the bot from the bot_processes dictionary
+            if bot_process is None:
+                logging.error(f"Bot {bot_id} is not running.")
+                continue
+            try:
+                # Wait for the bot process to terminate
+                bot_process.wait(max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                # If the process does not terminate within the timeout, kill it
+                bot_process.kill()
+                bot_process.wait()  # Wait for the process to terminate
+            self.set_bot_status(bot_id, "Stopped")
+            logging.info(f"Stopped bot {bot_id}")
+
+    def request_stop(self, bot_id):
+        """Send a bot the stop command."""
+        logging.info(f"Requesting {bot_id} stop.")
+        self.send_message(bot_id, {"command": "stop"})
 
     def shutdown(self):
-        """Shutdown the manager. Stop all bots if the stop_bots_on_shutdown configuration option is set."""
+        """Shutdown the manager. Stop all bots if the stopbotsonshutdown configuration option is set."""
         logging.info("Shutting down the manager.")
-        self.shuttingdown = True
-        if self.config.get("Manager", {}).get("stop_bots_on_shutdown", False):
-            for bot_id in self.bot_processes.keys():
-                self.stop_bot(bot_id)
+        if self.config.get("Manager", {}).get("stopbotsonshutdown", False):
+            self.stop_bots(tuple(self.bot_processes))
         self.root.destroy()
 
     def open_log(self, bot_id):
-        """Open the log file for a bot in Notepad++ or Notepad."""
+        """Open the log file for a bot in the default viewer for log files."""
+        self.submit_file_work(self.view_bot_log, bot_id)
+
+    def view_bot_log(self, bot_id):
+        """Find a bot's latest log file and open it in the log viewer. Runs on the file executor."""
         log_file = self.get_bot_log_file(bot_id)
         if not log_file:
             logging.error(f"No log file found for bot {bot_id}.")
             return
-        try:
-            subprocess.Popen(["notepad++.exe", log_file])
-            logging.info(f"Opened {bot_id} log in Notepad++")
-        except FileNotFoundError:
-            try:
-                subprocess.Popen(["notepad.exe", log_file])
-                logging.info(f"Opened {bot_id} log in Notepad")
-            except FileNotFoundError:
-                logging.error(
-                    f"Failed to open {bot_id} log file. Please ensure that Notepad or Notepad++ is installed."
-                )
+        self.spawn_viewer(log_file, bot_id)
 
 
 # This block of code will only run if this script is executed directly from the command line.
@@ -1,8 +1,16 @@
-import argparse
+import os
+import time
+import asyncio
 import logging
-import discord
+from discord import HTTPException
 from discord.ext import commands
 from botbase import BotBase
+from helpers.ratelimit import AIMDLimiter
+
+# Echoes that arrive in one channel within this many seconds are sent back as a single message
+ECHO_BATCH_SECONDS = 0.05
+# Discord rejects messages longer than this many characters
+DISCORD_MESSAGE_LIMIT = 2000
 
 
 class TestBot(BotBase):
@@ -10,9 +18,18 @@ class TestBot(BotBase):
     A subclass of BotBase that implements TestBot specific commands.
     """
 
-    def __init__(self, bot_id=None):
-        super().__init__(bot_id)
-        logging.info("Bot initialized.")
+    # TestBot's own attributes live in slots; BotBase still provides a __dict__ for everything else
+    __slots__ = ("logger", "echo_limiter", "echo_tasks", "echo_batches")
+
+    def __init__(self, bot_id=None, manager_fd=None):
+        super().__init__(bot_id, manager_fd)
+        # Named after the class, so the %(name)s field of the log format shows which bot logged each record
+        self.logger = logging.getLogger(type(self).__name__)
+        # Bound how many echo replies are sent to Discord at once, backing off when Discord slows down or throttles us
+        self.echo_limiter = AIMDLimiter(max_limit=int(os.getenv("MAX_CONCURRENT_OPERATIONS", 8)))
+        self.echo_tasks = set() # Hold references to in-flight echo tasks so they are not garbage collected
+        self.echo_batches = {} # Echoes waiting to be sent, by channel id
+        self.logger.info("Bot initialized.")
 
     def main_loop(self):
         """
@@ -24,8 +41,47 @@ class TestBot(BotBase):
     async def echo(self, ctx, *, message=None):
         """
         Respond with the same message that was received.
+        Echoes in the same channel are collected for a short window and sent as one reply from a separate task.
+        """
+        if not message:
+            return # Discord rejects empty messages
+        batch = self.echo_batches.get(ctx.channel.id)
+        if batch is not None:
+            batch.append(message) # A flush is already scheduled for this channel
+            return
+        self.echo_batches[ctx.channel.id] = [message]
+        task = asyncio.create_task(self.flush_echoes(ctx))
+        self.echo_tasks.add(task)
+        task.add_done_callback(self.echo_tasks.discard)
+
+    async def flush_echoes(self, ctx):
+        """
+        Wait for the batching window to close, then send every echo collected for the channel.
         """
-        await ctx.send(message)
+        await asyncio.sleep(ECHO_BATCH_SECONDS)
+        messages = self.echo_batches.pop(ctx.channel.id)
+        await self.send_echo(ctx, "\n".join(messages))
+
+    async def send_echo(self, ctx, message):
+        """
+        Send an echo reply once a concurrency slot is free, split into as many messages as Discord needs.
+        """
+        await self.echo_limiter.acquire()
+        started = time.monotonic()
+        sends = 0
+        throttled = False
+        try:
+            for start in range(0, len(message), DISCORD_MESSAGE_LIMIT):
+                sends += 1
+                await ctx.send(message[start:start + DISCORD_MESSAGE_LIMIT])
+        except HTTPException as e:
+            throttled = e.status == 429 or e.status >= 500 # Discord is rate limiting or overloaded
+            self.logger.error("Failed to send echo: %s", e)
+        except Exception as e:
+            self.logger.error("Failed to send echo: %s", e)
+        finally:
+            # The limiter judges the latency of one send, so long echoes are not mistaken for congestion
+            await self.echo_limiter.release((time.monotonic() - started) / max(sends, 1), throttled)
 
     def initialize_bot_commands(self):
         """
@@ -34,7 +90,7 @@ class TestBot(BotBase):
         super().initialize_bot_commands()
 
     async def on_ready(self):
-        logging.info(f"{self.__class__.__name__} has connected to Discord!")
+        self.logger.info("Connected to Discord!")
 
     def shutdown(self):
         """
@@ -50,9 +106,4 @@ class TestBot(BotBase):
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Run a TestBot.")
-    parser.add_argument( "--bot_id", help="The bot ID.")
-    args = parser.parse_args()
-
-    bot = TestBot(bot_id=args.bot_id)
-    bot.run()
+    TestBot.main()